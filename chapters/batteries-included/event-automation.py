@@ -4,8 +4,8 @@ from prefect.blocks.system import Secret
 
 
 @task(retries=3, log_prints=True)
-def get_nautobot_intf_id(device: str, interface: str) -> str | None:
-    """Retrieve the Nautobot Interface ID."""
+def update_nautobot_intf_state(device: str, interface: str, status: str) -> str | None:
+    """Look up the device interface in Nautobot and update its status, returns the Interface ID."""
 
     # GraphQL query to retrieve the device interfaces information
     gql = """
@@ -20,65 +20,57 @@ def get_nautobot_intf_id(device: str, interface: str) -> str | None:
     }
     """
 
-    # Retrieve the Nautobot API token from Prefect Block Secret
+    # Retrieve the Nautobot API token from Prefect Block Secret
     secret_block = Secret.load("nautobot-token")
     nautobot_token = secret_block.get()
 
-    # Get the device information from Nautobot using GraphQL
-    response = requests.post(
-        url="http://localhost:8080/api/graphql/",
-        headers={"Authorization": f"Token {nautobot_token}"},
-        json={"query": gql, "variables": {"device": device}},
-    )
-    response.raise_for_status()
+    # Reuse the same HTTP connection for the lookup and the update
+    with requests.Session() as session:
+        session.headers["Authorization"] = f"Token {nautobot_token}"
 
-    # Parse the response and return the interface ID
-    result = response.json()["data"]["devices"][0]
-    for intf in result["interfaces"]:
-        if intf["name"] == interface:
-            return intf["id"]
+        # Get the device information from Nautobot using GraphQL
+        response = session.post(
+            url="http://localhost:8080/api/graphql/",
+            json={"query": gql, "variables": {"device": device}},
+        )
+        response.raise_for_status()
 
+        # Parse the response and look for the interface ID
+        result = response.json()["data"]["devices"][0]
+        intf_id = next((intf["id"] for intf in result["interfaces"] if intf["name"] == interface), None)
+        if intf_id is None:
+            return None
 
-@task(retries=3, log_prints=True)
-def update_nautobot_intf_state(interface_id: str, status: str) -> bool:
-    """Update the device interface status."""
-
-    # Retrieve the Nautobot API token from Prefect Block Secret
-    secret_block = Secret.load("nautobot-token")
-    nautobot_token = secret_block.get()
+        # Print the interface ID
+        print(f"Interface: {interface} == ID: {intf_id}")
 
-    # Mapping Alertmanager status to Nautobot status
-    status = "lab-active" if status == "resolved" else "Alerted"
+        # Mapping Alertmanager status to Nautobot status
+        status = "lab-active" if status == "resolved" else "Alerted"
 
-    # Update the interface status
-    result = requests.patch(
-        url=f"http://localhost:8080/api/dcim/interfaces/{interface_id}/",
-        headers={"Authorization": f"Token {nautobot_token}"},
-        json={"status": status},
-    )
-    result.raise_for_status()
+        # Update the interface status
+        result = session.patch(
+            url=f"http://localhost:8080/api/dcim/interfaces/{intf_id}/",
+            json={"status": status},
+        )
+        result.raise_for_status()
 
     # Print the result to console
-    print(f"Interface ID {interface_id} status updated to {status}")
+    print(f"Interface ID {intf_id} status updated to {status}")
 
-    return True
+    return intf_id
 
 
 @flow(log_prints=True)
 def interface_flapping_processor(device: str, interface: str, status: str) -> bool:
     """Interface Flapping Event Processor."""
 
-    # Retrieve Nautobot Interface ID
-    intf_id = get_nautobot_intf_id(device=device, interface=interface)
+    # Look up the interface and update its status in Nautobot
+    intf_id = update_nautobot_intf_state(device=device, interface=interface, status=status)
     if intf_id is None:
         raise ValueError("Interface not found in Nautobot")
 
-    # Print the interface ID
-    print(f"Interface: {interface} == ID: {intf_id}")
+    return True
 
-    # Update the device interface status in Nautobot
-    is_good = update_nautobot_intf_state(interface_id=intf_id, status=status)
-    return is_good
 
 @flow(log_prints=True)
 def alert_receiver(alert_group: dict):
@@ -314,15 +314,15 @@ def site_health(site: str):
 
     # Now lets collect the logs for the site in the last 15 minutes
     log_results = []
+
+    # Set the start and end time for the query based on the current time and 15 minutes ago
+    end_time = time.time()
+    start_time = end_time - 15 * 60
+
     for device_name in devices.keys():
         # Create the Loki query filtering by device
         query = f'{{device=~"{device_name}"}}'
 
-        # Set the start and end time for the query based on the current time and 15 minutes ago
-        now = datetime.datetime.now()
-        start_time = datetime.datetime.timestamp(now - datetime.timedelta(minutes=15))
-        end_time = datetime.datetime.timestamp(now)
-
         # Retrieve the logs
         loki_results = retrieve_data_loki(query, start_time, end_time)  # type: ignore
 
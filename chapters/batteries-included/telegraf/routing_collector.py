@@ -1,14 +1,59 @@
 """BGP neighbor state_pfxrcd/state_pfxacc to InfluxDB line protocol script."""
 
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
 
+import textfsm
 from netmiko import BaseConnection, ConnectHandler
+from netmiko.utilities import get_template_dir
 
+# Substring of the (lowercased) BGP state and its readable format, in match order
+BGP_STATE_MAPPING = (
+    ("estab", "ESTABLISHED"),
+    ("idle", "IDLE"),
+    ("connect", "CONNECT"),
+    ("active", "ACTIVE"),
+    ("opensent", "OPENSENT"),
+    ("openconfirm", "OPENCONFIRM"),
+)
 
-@dataclass
+# DR/BDR role suffix of an OSPF neighbor state (e.g. FULL/DR)
+OSPF_ROLE_RE = re.compile(r"/B?DR")
+
+
+def escape_value(value):
+    """Escape the spaces of a string value for the line protocol."""
+    return value.replace(" ", r"\ ") if isinstance(value, str) else value
+
+
+def escape_tag(value):
+    """Escape the spaces, commas and equal signs of a string tag value for the line protocol."""
+    if isinstance(value, str):
+        return value.replace(" ", r"\ ").replace(",", r"\,").replace("=", r"\=")
+    return value
+
+
+def format_field(key, value) -> str:
+    """Format a field of a type without a specific formatter."""
+    return f"{key}={value}"
+
+
+# Line protocol formatter per field value type, looked up by exact type so `bool` is not formatted as `int`
+FIELD_FORMATTERS = {
+    bool: lambda key, value: f"{key}=true" if value else f"{key}=false",
+    int: lambda key, value: f"{key}={value}i",
+    float: format_field,
+    str: lambda key, value: f'{key}="{escape_value(value)}"',
+}
+
+
+@dataclass(slots=True)
 class InfluxMetric:
     measurement: str
     tags: dict
@@ -16,28 +61,12 @@ class InfluxMetric:
     time: Optional[int] = None
 
     def __str__(self):
-        tags_string = ""
-        for key, value in self.tags.items():
-            if value is not None:
-                if isinstance(value, str):
-                    value = value.replace(" ", r"\ ")
-                tags_string += f",{key}={value}"
-
-        fields_string = ""
-        for key, value in self.fields.items():
-            if fields_string:
-                fields_string += ","
-            if isinstance(value, bool):
-                fields_string += f"{key}=true" if value else f"{key}=false"
-            elif isinstance(value, (int)):
-                fields_string += f"{key}={value}i"
-            elif isinstance(value, (float)):
-                fields_string += f"{key}={value}"
-            elif isinstance(value, str):
-                value = value.replace(" ", r"\ ")
-                fields_string += f'{key}="{value}"'
-            else:
-                fields_string += f"{key}={value}"
+        tags_string = "".join(
+            f",{key}={escape_tag(value)}" for key, value in self.tags.items() if value is not None
+        )
+        fields_string = ",".join(
+            FIELD_FORMATTERS.get(type(value), format_field)(key, value) for key, value in self.fields.items()
+        )
 
         return (
             f"{self.measurement}{tags_string} {fields_string} {self.time}"
@@ -46,9 +75,28 @@ class InfluxMetric:
         )
 
 
+@lru_cache(maxsize=None)
+def get_textfsm_template(platform: str, command: str) -> textfsm.TextFSM:
+    """Load and compile the ntc-templates TextFSM template of a platform command, once per run."""
+    template_file = Path(get_template_dir()) / f"{platform}_{command.replace(' ', '_')}.textfsm"
+    with template_file.open() as template:
+        return textfsm.TextFSM(template)
+
+
+def parse_command(net_connect: BaseConnection, command: str) -> list[dict]:
+    """Run a command and parse its output, with the same lowercase keys as `use_textfsm=True`.
+
+    An empty output or a CLI error does not match the template and returns no rows.
+    """
+    fsm = get_textfsm_template(net_connect.device_type, command)
+    fsm.Reset()
+    output = net_connect.send_command(command)
+    return [{key.lower(): value for key, value in row.items()} for row in fsm.ParseTextToDicts(output)]
+
+
 def bgp_collector(net_connect: BaseConnection) -> list[InfluxMetric]:
     """Collect BGP neighbor information."""
-    bgp_output = net_connect.send_command("show ip bgp summary", use_textfsm=True)
+    bgp_output = parse_command(net_connect, "show ip bgp summary")
 
     results = []
     for neighbor in bgp_output:
@@ -61,20 +109,12 @@ def bgp_collector(net_connect: BaseConnection) -> list[InfluxMetric]:
         }
 
         # Convert the state to a more readable format
-        if "Estab" in neighbor["state"]:  # type: ignore
-            state = "ESTABLISHED"
-        elif "Idle" in neighbor["state"]:  # type: ignore
-            state = "IDLE"
-        elif "Connect" in neighbor["state"]:  # type: ignore
-            state = "CONNECT"
-        elif "Active" in neighbor["state"]:  # type: ignore
-            state = "ACTIVE"
-        elif "opensent" in neighbor["state"].lower():  # type: ignore
-            state = "OPENSENT"
-        elif "openconfirm" in neighbor["state"].lower():  # type: ignore
-            state = "OPENCONFIRM"
-        else:
-            state = neighbor["state"].upper()  # type: ignore
+        neighbor_state = neighbor["state"]  # type: ignore
+        neighbor_state_lower = neighbor_state.lower()
+        state = next(
+            (value for prefix, value in BGP_STATE_MAPPING if prefix in neighbor_state_lower),
+            neighbor_state.upper(),
+        )
 
         fields = {"neighbor_state": state}
 
@@ -89,7 +129,7 @@ def bgp_collector(net_connect: BaseConnection) -> list[InfluxMetric]:
 
 def ospf_collector(net_connect: BaseConnection) -> list[InfluxMetric]:
     """Collect OSPF neighbor information."""
-    ospf_output = net_connect.send_command("show ip ospf neighbor", use_textfsm=True)
+    ospf_output = parse_command(net_connect, "show ip ospf neighbor")
 
     results = []
     for neighbor in ospf_output:
@@ -103,13 +143,22 @@ def ospf_collector(net_connect: BaseConnection) -> list[InfluxMetric]:
             "vrf": neighbor["vrf"],  # type: ignore
         }
 
-        state = neighbor["state"].replace("/BDR", "").replace("/DR", "")  # type: ignore
+        state = OSPF_ROLE_RE.sub("", neighbor["state"])  # type: ignore
         fields = {"neighbor_state": state.upper()}
         results.append(InfluxMetric(measurement, tags, fields))
 
     return results
 
 
+def run_collector(collector: Callable[[BaseConnection], list[InfluxMetric]], device: dict) -> list[InfluxMetric]:
+    """Open an SSH connection to the device, run the collector on it and close the connection."""
+    net_connect = ConnectHandler(**device)
+    try:
+        return collector(net_connect)
+    finally:
+        net_connect.disconnect()
+
+
 def main(device_type, host):
     """Connect to a device and print the BGP neighbor pfxrcd/pfxacc value in the influx line protocol format."""
     # Define the device to connect to
@@ -121,21 +170,16 @@ def main(device_type, host):
         "password": os.getenv("NETWORK_AGENT_PASSWORD"),
     }
 
-    # Establish an SSH connection to the device by passing in the device dictionary
-    net_connect = ConnectHandler(**device)
-
-    # Collect BGP neighbor information
-    bgp_metrics = bgp_collector(net_connect)
-    for metric in bgp_metrics:
-        print(metric, flush=True)
-
-    # Collect OSPF neighbor information
-    ospf_metrics = ospf_collector(net_connect)
-    for metric in ospf_metrics:
-        print(metric, flush=True)
+    # Run each collector on its own SSH session (a netmiko connection is not thread-safe)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(run_collector, collector, device) for collector in (bgp_collector, ospf_collector)]
+        # The BGP metrics first, then the OSPF metrics
+        lines = [str(metric) for future in futures for metric in future.result()]
 
-    # Close the SSH connection
-    net_connect.disconnect()
+    # Write all the metrics at once instead of one write per metric
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
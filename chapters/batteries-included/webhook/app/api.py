@@ -1,3 +1,4 @@
+import hashlib
 import logging
 from typing import Literal
 
@@ -12,8 +13,8 @@ log = logging.getLogger("webhook")
 
 class AlertmanagerAlert(BaseModel):
     status: str
-    labels: dict
-    annotations: dict
+    labels: dict[str, str]
+    annotations: dict[str, str]
     startsAt: str
     endsAt: str
     generatorURL: str
@@ -26,28 +27,49 @@ class AlertmanagerAlertGroup(BaseModel):
     truncatedAlerts: int
     status: Literal["firing", "resolved"]
     receiver: str
-    groupLabels: dict
-    commonLabels: dict
-    commonAnnotations: dict
+    groupLabels: dict[str, str]
+    commonLabels: dict[str, str]
+    commonAnnotations: dict[str, str]
     externalURL: str
     alerts: list[AlertmanagerAlert]
 
 
-@router.post("/v1/api/webhook", status_code=204)
-def process_webhook(alert_group: AlertmanagerAlertGroup):
-    """Process an alertmanager webhook to send data to Prefect for automated workflows."""
-    log.info("Alertmanager webhook status is firing")
-    log.info(f"Received alertmanager webhook: {alert_group}")
+def idempotency_key(alert_group: AlertmanagerAlertGroup) -> str:
+    """Build a key identifying a notification, so Prefect ignores the repeated ones.
+
+    Alertmanager re-sends the same notification on retries and repeat intervals, a new firing
+    or resolution of an alert changes its status or start time and therefore the key.
+    """
+    alerts = sorted(f"{alert.fingerprint}:{alert.status}:{alert.startsAt}" for alert in alert_group.alerts)
+    key = "\n".join([alert_group.groupKey, alert_group.status, *alerts])
+    return hashlib.sha256(key.encode()).hexdigest()
 
-    error = ""
+
+async def submit_alert_group(alert_group: AlertmanagerAlertGroup):
+    """Submit the alert group to the Prefect alert receiver deployment."""
     try:
-        _ = run_deployment(
+        # Only wait for the flow run to be created, not for it to finish
+        _ = await run_deployment(
             name="alert-receiver/alert-receiver",
             parameters={"alert_group": alert_group.model_dump(mode="json")},
+            idempotency_key=idempotency_key(alert_group),
+            timeout=0,
         )
 
-        log.info(f"Alert status is {alert_group.status}, exiting")
+        log.info("Alert status is %s, exiting", alert_group.status)
     except Exception as e:
-        log.error(f"Error running deployment: {e}")
-        error = str(e)
-    return {"message": "Processed webhook"} if not error else {"error": error}
+        log.error("Error running deployment: %s", e)
+
+
+@router.post("/v1/api/webhook", status_code=202)
+async def process_webhook(alert_group: AlertmanagerAlertGroup, background_tasks: fastapi.BackgroundTasks):
+    """Process an alertmanager webhook to send data to Prefect for automated workflows.
+
+    The alert group is submitted to Prefect after the response is sent, so Alertmanager is not held
+    waiting on the Prefect API.
+    """
+    log.info("Alertmanager webhook status is firing")
+    log.debug("Received alertmanager webhook: %s", alert_group)
+
+    background_tasks.add_task(submit_alert_group, alert_group)
+    return {"message": "Accepted webhook"}
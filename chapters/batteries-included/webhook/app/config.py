@@ -5,9 +5,8 @@ import sys
 
 import toml
 from pathlib import Path
-from pydantic import BaseModel
-from pydantic_settings import BaseSettings
-from pydantic.error_wrappers import ValidationError
+from pydantic import BaseModel, ValidationError
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 SETTINGS = None
 ENV_FILE_PATH = Path(__file__) / ".." / ".." / ".." / ".." / ".env"
@@ -52,11 +51,7 @@ class Settings(BaseSettings):  # pylint: disable=too-few-public-methods
     host: str = "0.0.0.0"
     port: int = 9997
 
-    class Config:  # pylint: disable=too-few-public-methods
-        """Config class to be used for Settings"""
-
-        env_file = ENV_FILE_PATH.resolve()
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(env_file=ENV_FILE_PATH.resolve(), env_file_encoding="utf-8")
 
 
 def load(config_file_name="pyproject.toml", config_data=None):
@@ -5,15 +5,17 @@ from logging.config import dictConfig
 
 import fastapi
 import uvicorn
+from fastapi.responses import ORJSONResponse
 from app import config
 from app import api
 
 
-dictConfig(config.LogConfig().dict())
+dictConfig(config.LogConfig().model_dump())
 log = logging.getLogger("webhook")
 
 
-app = fastapi.FastAPI()
+# Serialize the JSON responses with orjson instead of the standard library json
+app = fastapi.FastAPI(default_response_class=ORJSONResponse)
 config.load()
 
 
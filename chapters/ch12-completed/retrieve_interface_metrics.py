@@ -4,13 +4,13 @@ import time
 from prometheus_api_client import PrometheusConnect
 from rich import print as rprint
 
+# Create a Prometheus API client, reused across queries so its HTTP connection is kept alive
+prom = PrometheusConnect(url="http://localhost:9090", disable_ssl=True)
+
 
 def retrieve_data_prometheus(query: str) -> list[dict]:
     """Collect metrics from Prometheus."""
 
-    # Create a Prometheus API client
-    prom = PrometheusConnect(url="http://localhost:9090", disable_ssl=True)
-
     # Query Prometheus and return the results
     return prom.custom_query(query=query)
 
@@ -25,10 +25,10 @@ def get_interface_usage(
 
     # Query to get the Interface In bytes for last 30min
     query = f'interface_in_octets{{device="{device}",name="{interface}"}}[30m]'
-    log.debug(f"Query: {query}")
+    log.debug("Query: %s", query)
 
     response = prom.custom_query(query)
-    log.debug(f"Response: {response}")
+    log.debug("Response: %s", response)
 
     return response[0]["values"]
 
@@ -1,11 +1,11 @@
 import logging
+import time
 from typing import Literal
-from datetime import datetime, timedelta
 
 import fastapi
 from pydantic import BaseModel
 
-from .rca import retrieve_data_loki, generate_rca_prompt, ask_openai
+from .rca import generate_rcas
 
 from .anomaly import look_for_anomalies
 
@@ -44,9 +44,9 @@ def check_for_anomalies(
     t1: float = fastapi.Query(description="Time when the network change started as a timestamp."),
     t2: float = fastapi.Query(description="Time when the network change finished as a timestamp."),
 ):
-    log.info(f"Checking if the interface {interface} in device {device} is having a normal activity")
+    log.info("Checking if the interface %s in device %s is having a normal activity", interface, device)
     anomalies = look_for_anomalies(device, interface, t1, t2)
-    log.info(f"Detected anomalies: {anomalies}")
+    log.debug("Detected anomalies: %s", anomalies)
 
     status_normal = True if anomalies.empty else False
     message = f"Interface {interface} in {device} traffic for {t2} was "
@@ -55,27 +55,29 @@ def check_for_anomalies(
 
 
 @router.post("/v1/api/rca-webhook", status_code=204)
-def process_webhook(alertmanager_webhook: AlertmanagerWebhook):
+async def process_webhook(alertmanager_webhook: AlertmanagerWebhook):
     """Process an alertmanager webhook to provide a Root Cause Analysis."""
     log.info("Alertmanager webhook status is firing, let's provide some educated guesses...")
-    log.info(f"Received alertmanager webhook: {alertmanager_webhook.json()}")
+    log.debug("Received alertmanager webhook: %s", alertmanager_webhook)
 
-    for alert in alertmanager_webhook.alerts:
-        device_name = alert.labels["device"]
-        now = datetime.now()
-        loki_logs = retrieve_data_loki(
-            query=f'{{device="{device_name}"}}',
-            # Look back for 10 minutes
-            start_timestamp=datetime.timestamp(now - timedelta(hours=0, minutes=10)),
-            end_time=datetime.timestamp(now),
-        )
-        log.info(f"Loki logs: {loki_logs}")
+    # Look back for 10 minutes, same window for every alert in the group
+    end_time = time.time()
+    start_timestamp = end_time - 10 * 60
 
-        prompt = generate_rca_prompt(loki_logs, device_name, alert.labels["neighbor"], alert.labels["neighbor_asn"])
+    # Single pass over the alerts, skipping the ones missing a label and the repeated BGP neighbors
+    bgp_neighbors = {}
+    for alert in alertmanager_webhook.alerts:
+        labels = alert.labels
+        neighbor = (labels.get("device"), labels.get("neighbor"), labels.get("neighbor_asn"))
+        if all(neighbor):
+            bgp_neighbors[neighbor] = True
+    bgp_neighbors = list(bgp_neighbors)
 
-        rca_response = ask_openai(prompt)
+    # Provide the RCAs of all the alerts at once
+    rca_responses = await generate_rcas(bgp_neighbors, start_timestamp, end_time) if bgp_neighbors else []
 
-        log.info(f"RCA Analysis: {rca_response}")
+    for rca_response in rca_responses:
+        log.info("RCA Analysis: %s", rca_response)
 
-    log.info(f"Alert status is {alertmanager_webhook.status}, exiting")
+    log.info("Alert status is %s, exiting", alertmanager_webhook.status)
     return {"message": "Processed webhook"}
@@ -1,46 +1,118 @@
+import asyncio
+import hashlib
+import json
 import os
 import logging
+import re
+import time
+from functools import lru_cache
 from typing import Literal
 
-import requests
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 
 
 log = logging.getLogger("machine-learning")
 
+# Shared async HTTP client so the Loki queries reuse keep-alive connections
+loki_client = httpx.AsyncClient(
+    base_url="http://loki:3001",
+    timeout=httpx.Timeout(10.0, connect=3.0),
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=4),
+)
 
-def retrieve_data_loki(query: str, start_timestamp: int, end_time: int) -> dict:
-    """Retrieve data from Grafana Loki.
+# Limit the number of RCAs running at the same time, to stay within the OpenAI rate limits
+rca_semaphore = asyncio.Semaphore(4)
+
+# RCAs already provided, keyed by the alert and its log templates, reused for 15 minutes
+RCA_CACHE_TTL = 15 * 60
+rca_cache: dict[str, tuple[float, str]] = {}
+
+# Variable parts of a log message (timestamps, counters, IPs, hex IDs)
+LOG_VARIABLES_RE = re.compile(r"0x[0-9a-fA-F]+|\d+(?:[.:/]\d+)*")
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> AsyncOpenAI:
+    """Return the OpenAI client, created once on first use and reused afterwards."""
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+async def retrieve_data_loki(query: str, start_timestamp: int, end_time: int) -> list[tuple[str, str]]:
+    """Retrieve log messages from Grafana Loki.
     Args:
         query (str): Loki query
         start_timestamp (int): Start timestamp
         end_time (int): End timestamp
     Returns:
-        dict: Loki query result
+        list[tuple[str, str]]: Process and message of each log line
     """
     log.info("Retrieving data from Loki...")
 
-    response = requests.get(
-        url=f"http://loki:3001/loki/api/v1/query_range",
+    response = await loki_client.get(
+        "/loki/api/v1/query_range",
         params={
             "query": query,
             "start": int(start_timestamp),
             "end": int(end_time),
-            "limit": 1000,
+            "limit": 200,
+            "direction": "backward",
         },
     )
     log.info("Data retrieved from Loki")
-    return response.json()["data"]["result"]
 
+    # Only keep what the RCA uses, so the rest of the response (timestamps, labels) is released right away
+    # The process (e.g. ADJCHANGE) is only kept as a label, the message has it stripped
+    return [
+        (stream["stream"].get("vendor_facility_process", ""), message)
+        for stream in response.json()["data"]["result"]
+        for _, message in stream["values"]
+    ]
 
-def generate_rca_prompt(loki_results, device_name, neighbor_id, neighbor_asn):
+
+def log_template(message: str) -> str:
+    """Mask the variable parts of a log message, so similar messages share the same template."""
+    return LOG_VARIABLES_RE.sub("<*>", message.strip())
+
+
+def summarize_logs(loki_logs: list[tuple[str, str]]) -> list[dict]:
+    """Group the Loki log messages by template, keeping a count and an example of each template.
+    Args:
+        loki_logs (list[tuple[str, str]]): Process and message of each log line
+    Returns:
+        list[dict]: Log templates with their process, count and an example message
+    """
+    summary = {}
+    for process, message in loki_logs:
+        template = log_template(message)
+        entry = summary.get((process, template))
+        if entry:
+            entry["count"] += 1
+        else:
+            summary[(process, template)] = {
+                "process": process,
+                "template": template,
+                "count": 1,
+                "example": message.strip(),
+            }
+    return list(summary.values())
+
+
+def rca_cache_key(log_summary: list[dict], device_name: str, neighbor_id: str, neighbor_asn: str) -> str:
+    """Build the RCA cache key from the alert labels and the templates of its associated logs."""
+    templates = sorted(f"{entry['process']}: {entry['template']}" for entry in log_summary)
+    key = "\n".join([device_name, neighbor_id, neighbor_asn, *templates])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def generate_rca_prompt(log_summary, device_name, neighbor_id, neighbor_asn):
     return f"""
    RCA for a BGP neighbor issue
    Available Data:
    - A BGP session in {device_name} has changed from Established to another non desired state
    - BGP neighbor IP: {neighbor_id}
    - BGP neighbor ASN: {neighbor_asn}
-   - Associated Logs: {loki_results}
+   - Associated Logs (grouped by template, with their count and an example): {log_summary}
    Analysis Questions:
    - Based on the available data, what are the potential causes for the lost of BGP Established state?
    - What system interactions or external factors could have influenced this event?
@@ -51,7 +123,7 @@ def generate_rca_prompt(loki_results, device_name, neighbor_id, neighbor_asn):
    """
 
 
-def ask_openai(prompt: str, model: str = "gpt-3.5-turbo") -> str:
+async def ask_openai(prompt: str, model: str = "gpt-3.5-turbo") -> str:
     """
     Ask OpenAI a question and return the response.
     Args:
@@ -61,8 +133,8 @@ def ask_openai(prompt: str, model: str = "gpt-3.5-turbo") -> str:
         str: The response from OpenAI.
     """
     # Construct the prompt for OpenAI
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    response = client.chat.completions.create(
+    client = get_openai_client()
+    response = await client.chat.completions.create(
         model=model,
         messages=[
             {
@@ -72,5 +144,108 @@ def ask_openai(prompt: str, model: str = "gpt-3.5-turbo") -> str:
         ],
     )
 
-    log.info(response)
+    log.debug("OpenAI response: %s", response)
     return response.choices[0].message.content
+
+
+async def ask_openai_batch(prompts: list[str], model: str = "gpt-3.5-turbo") -> list[str]:
+    """
+    Ask OpenAI several questions in a single request and return the responses, in the same order.
+    Args:
+        prompts (list[str]): The prompts to send to OpenAI.
+        model (str, optional): The model to use, it must support JSON mode. Defaults to "gpt-3.5-turbo".
+    Returns:
+        list[str]: The responses from OpenAI.
+    """
+    if len(prompts) == 1:
+        return [await ask_openai(prompts[0], model=model)]
+
+    client = get_openai_client()
+    response = await client.chat.completions.create(
+        model=model,
+        response_format={"type": "json_object"},
+        messages=[
+            {
+                "role": "system",
+                "content": (
+                    "You receive a JSON array of independent requests. Answer each one of them separately and reply "
+                    'with a JSON object {"rcas": [...]} holding one string answer per request, in the same order.'
+                ),
+            },
+            {
+                "role": "user",
+                "content": json.dumps(prompts),
+            },
+        ],
+    )
+
+    log.debug("OpenAI response: %s", response)
+    rcas = json.loads(response.choices[0].message.content)["rcas"]
+    if len(rcas) != len(prompts):
+        raise ValueError(f"OpenAI returned {len(rcas)} RCAs for {len(prompts)} prompts")
+    return rcas
+
+
+async def summarize_alert_logs(device_name: str, start_timestamp: float, end_time: float) -> list[dict]:
+    """Retrieve the logs of a device from Loki and group them by template."""
+    async with rca_semaphore:
+        # Only the routing protocols and link state logs are relevant for the RCA
+        loki_logs = await retrieve_data_loki(
+            query=f'{{device="{device_name}"}} | vendor_facility=~"BGP|OSPF|LINEPROTO|LINK"',
+            start_timestamp=start_timestamp,
+            end_time=end_time,
+        )
+    log.debug("Loki logs: %s", loki_logs)
+
+    # Summarize the logs, so the prompt only carries each kind of log once
+    return summarize_logs(loki_logs)
+
+
+async def generate_rcas(
+    alerts: list[tuple[str, str, str]],
+    start_timestamp: float,
+    end_time: float,
+) -> list[str]:
+    """Generate the Root Cause Analysis for several BGP neighbor alerts, with a single OpenAI request.
+    Args:
+        alerts (list[tuple[str, str, str]]): Device, BGP neighbor IP and BGP neighbor ASN of each alert
+        start_timestamp (float): Start timestamp of the logs to look at
+        end_time (float): End timestamp of the logs to look at
+    Returns:
+        list[str]: The RCAs from OpenAI, in the same order as the alerts.
+    """
+    log_summaries = await asyncio.gather(
+        *[summarize_alert_logs(device_name, start_timestamp, end_time) for device_name, _, _ in alerts]
+    )
+
+    # Reuse a recent RCA when the same alert comes with the same kind of logs
+    now = time.monotonic()
+    rca_responses: list[str | None] = []
+    cache_keys = []
+    for (device_name, neighbor_id, neighbor_asn), log_summary in zip(alerts, log_summaries):
+        cache_key = rca_cache_key(log_summary, device_name, neighbor_id, neighbor_asn)
+        cached = rca_cache.get(cache_key)
+        if cached and now - cached[0] < RCA_CACHE_TTL:
+            log.info("Reusing cached RCA for %s neighbor %s", device_name, neighbor_id)
+            rca_responses.append(cached[1])
+        else:
+            rca_responses.append(None)
+        cache_keys.append(cache_key)
+
+    # Ask for all the missing RCAs at once
+    missing = [index for index, rca_response in enumerate(rca_responses) if rca_response is None]
+    if not missing:
+        return rca_responses
+    prompts = [generate_rca_prompt(log_summaries[index], *alerts[index]) for index in missing]
+    async with rca_semaphore:
+        new_responses = await ask_openai_batch(prompts)
+
+    # Store the RCAs and drop the expired ones
+    now = time.monotonic()
+    for key in [key for key, (created, _) in rca_cache.items() if now - created >= RCA_CACHE_TTL]:
+        del rca_cache[key]
+    for index, rca_response in zip(missing, new_responses):
+        rca_cache[cache_keys[index]] = (now, rca_response)
+        rca_responses[index] = rca_response
+    return rca_responses
+
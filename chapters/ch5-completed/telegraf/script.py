@@ -1,35 +1,49 @@
 import os
 import sys
+from functools import lru_cache
+from pathlib import Path
 
+import textfsm
 from netmiko import ConnectHandler
+from netmiko.exceptions import NetmikoBaseException
+from netmiko.utilities import get_template_dir
+
+
+def escape_value(value):
+    """Escape the spaces of a string value for the line protocol."""
+    return value.replace(" ", r"\ ") if isinstance(value, str) else value
+
+
+def escape_tag(value):
+    """Escape the spaces, commas and equal signs of a string tag value for the line protocol."""
+    if isinstance(value, str):
+        return value.replace(" ", r"\ ").replace(",", r"\,").replace("=", r"\=")
+    return value
+
+
+def format_field(key, value) -> str:
+    """Format a field of a type without a specific formatter."""
+    return f"{key}={value}"
+
+
+# Line protocol formatter per field value type, looked up by exact type so `bool` is not formatted as `int`
+FIELD_FORMATTERS = {
+    bool: lambda key, value: f"{key}=true" if value else f"{key}=false",
+    int: lambda key, value: f"{key}={value}i",
+    float: format_field,
+    str: lambda key, value: f'{key}="{escape_value(value)}"',
+}
 
 
 def influx_line_protocol(measurement, tags, fields) -> str:
     """Generate an InfluxDB line protocol string."""
     # Construct the tags string
-    tags_string = ""
-    for key, value in tags.items():
-        if value is not None:
-            if isinstance(value, str):
-                value = value.replace(" ", r"\ ")
-            tags_string += f",{key}={value}"
+    tags_string = "".join(f",{key}={escape_tag(value)}" for key, value in tags.items() if value is not None)
 
     # Construct the fields string
-    fields_string = ""
-    for key, value in fields.items():
-        if fields_string:
-            fields_string += ","
-        if isinstance(value, bool):
-            fields_string += f"{key}=true" if value else f"{key}=false"
-        elif isinstance(value, int):
-            fields_string += f"{key}={value}i"
-        elif isinstance(value, float):
-            fields_string += f"{key}={value}"
-        elif isinstance(value, str):
-            value = value.replace(" ", r"\ ")
-            fields_string += f'{key}="{value}"'
-        else:
-            fields_string += f"{key}={value}"
+    fields_string = ",".join(
+        FIELD_FORMATTERS.get(type(value), format_field)(key, value) for key, value in fields.items()
+    )
 
     return f"{measurement}{tags_string} {fields_string}"
 
@@ -54,31 +68,47 @@ def netmiko_connect(device_type, host):
     return net_connect
 
 
+# Mapping of the BGP states reported by the device to a more readable format
+STATE_MAPPING = {
+    "Estab": "ESTABLISHED",
+    "Idle(NoIf)": "IDLE",
+    "Idle": "IDLE",
+    "Connect": "CONNECT",
+    "Active": "ACTIVE",
+    "opensent": "OPENSENT",
+    "openconfirm": "OPENCONFIRM"
+}
+
+
 def convert_state(state):
     """Convert the state to a more readable format."""
-    state_mapping = {
-        "Estab": "ESTABLISHED",
-        "Idle(NoIf)": "IDLE",
-        "Idle": "IDLE",
-        "Connect": "CONNECT",
-        "Active": "ACTIVE",
-        "opensent": "OPENSENT",
-        "openconfirm": "OPENCONFIRM"
-    }
-    # Return the mapped state or the original state in uppercase
-    return state_mapping.get(state, state.upper())
+    # Return the mapped state or the original state in uppercase, only uppercased when not mapped
+    return STATE_MAPPING.get(state) or state.upper()
 
 
-def main(device_type, host):
-    """Get BGP neighbor data and print it in Influx line protocol format."""
-    # Connect to the device (1)
-    net_connect = netmiko_connect(device_type, host)
+@lru_cache(maxsize=None)
+def get_textfsm_template(platform, command):
+    """Load and compile the ntc-templates TextFSM template of a platform command, once for the life of the script."""
+    template_file = Path(get_template_dir()) / f"{platform}_{command.replace(' ', '_')}.textfsm"
+    with template_file.open() as template:
+        return textfsm.TextFSM(template)
+
+
+def parse_command(net_connect, command):
+    """Run a command and parse its output, with the same lowercase keys as `use_textfsm=True`."""
+    fsm = get_textfsm_template(net_connect.device_type, command)
+    fsm.Reset()
+    output = net_connect.send_command(command)
+    return [{key.lower(): value for key, value in row.items()} for row in fsm.ParseTextToDicts(output)]
 
 
-    # Execute the command on the device (2)
-    output = net_connect.send_command("show ip bgp summary", use_textfsm=True)
+def collect_bgp(net_connect, host):
+    """Get BGP neighbor data and print it in Influx line protocol format."""
+    # Execute the command on the device and parse it with the compiled template (2)
+    output = parse_command(net_connect, "show ip bgp summary")
 
     # Iterate over the BGP neighbors and process the data (3)
+    lines = []
     for neighbor in output:
         measurement = "bgp"
         tags = {
@@ -104,9 +134,33 @@ def main(device_type, host):
         line_protocol = influx_line_protocol(measurement, tags, fields)
 
 
-        # Print the line protocol string (6)
+        # Collect the line protocol string
         # For example: bgp,neighbor=x.x.x.x,neighbor_asn=xxxx,vrf=default prefixes_received=0,prefixes_accepted=0
-        print(line_protocol, flush=True)
+        lines.append(line_protocol)
+
+
+    # Print all the line protocol strings at once (6)
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
+    sys.stdout.flush()
+
+
+def main(device_type, host):
+    """Keep a connection to the device and collect the BGP neighbor data every time Telegraf asks for it."""
+    # Connect to the device once, the SSH session is reused across collections (1)
+    net_connect = netmiko_connect(device_type, host)
+
+
+    # Telegraf `inputs.execd` writes a new line on stdin at every interval (signal = "STDIN")
+    for _ in sys.stdin:
+        try:
+            collect_bgp(net_connect, host)
+        except (OSError, EOFError, NetmikoBaseException) as err:
+            # The SSH session was lost, reconnect and collect again. If the device is still unreachable
+            # the script exits and Telegraf restarts it
+            print(f"[WARNING] Lost connection to {host} ({err}), reconnecting", file=sys.stderr, flush=True)
+            net_connect.disconnect()
+            net_connect = netmiko_connect(device_type, host)
+            collect_bgp(net_connect, host)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,39 @@
-import fileinput
 import os
+import re
+import select
 import sys
+import time
 from dataclasses import dataclass
 from typing import Optional
 
-import jmespath
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 
 # Define the Nautobot URL and API token
 NAUTOBOT_URL = "http://nautobot:8080"
 NAUTOBOT_SUPERUSER_API_TOKEN = os.getenv("NAUTOBOT_SUPERUSER_API_TOKEN", "")
 
+# Session kept for the life of the processor, so the Nautobot queries reuse the same connection
+nautobot_session = requests.Session()
+nautobot_session.headers.update(
+    {"Authorization": f"Token {NAUTOBOT_SUPERUSER_API_TOKEN}", "Content-Type": "application/json"}
+)
+nautobot_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+# Line protocol tokens, `\\.` keeps a backslash escaped character (space, comma, equal sign, quote) in its token
+# Measurement and tags of a line, up to the first unescaped space
+SERIES_RE = re.compile(r"((?:\\.|[^ ,\\])+)(?:,(?:\\.|[^ \\])+)?")
+# `key=value` pair of the tags and fields, a quoted string value may contain commas, spaces and escaped quotes
+KEY_VALUE_RE = re.compile(r'((?:\\.|[^,=\\])+)=("(?:\\.|[^"\\])*"|(?:\\.|[^,=\\])+)')
+# Fields of a line, up to the first unescaped space outside of a quoted string value
+FIELDS_RE = re.compile(r'(?:"(?:\\.|[^"\\])*"|\\.|[^ "\\])+')
+
+# Interface roles (labels) by interface name of each device (None if not found in Nautobot) with the time
+# they were retrieved, reused for a minute
+DEVICE_CACHE_TTL = 60
+device_cache: dict[str, tuple[float, Optional[dict[str, str]]]] = {}
 
 # Nautobot GraphQL query to retrieve device data
 NAUTOBOT_DEVICE_GQL = """
@@ -42,50 +64,64 @@ def parse_line(line: str) -> dict:
     Returns:
         dict: Dictionary with measurement, tags, fields, and optional time
     """
-    # Split the line into main components: measurement+tags, fields, and optional time
-    parts = line.split(" ")
-
-    # Extract measurement and tags
-    measurement_and_tags = parts[0]
-    if "," in measurement_and_tags:
-        measurement, tags_str = measurement_and_tags.split(",", 1)
-    else:
-        measurement = measurement_and_tags
-        tags_str = ""
-
-    # Parse tags
-    tags = {}
-    if tags_str:
-        for tag in tags_str.split(","):
-            key, value = tag.split("=")
-            tags[key] = value
+    line = line.rstrip("\n")
+
+    # Find the main components in a single pass: measurement+tags, fields, and optional time
+    series = SERIES_RE.match(line)
+    tags_end = series.end()
+    fields_end = FIELDS_RE.match(line, tags_end + 1).end()
+
+    # Extract measurement and tags, the tag values are kept escaped as they are written back as is
+    measurement = series[1]
+    tags = {match[1]: match[2] for match in KEY_VALUE_RE.finditer(line, series.end(1) + 1, tags_end)}
 
     # Extract and parse fields
-    fields_str = parts[1]
     fields = {}
-    for field in fields_str.split(","):
-        key, value = field.split("=")
+    for key, value in KEY_VALUE_RE.findall(line, tags_end + 1, fields_end):
         # Determine field type
-        if value.startswith('"') and value.endswith('"'):
+        if value[0] == '"' and value[-1] == '"':
             fields[key] = value[1:-1]  # String field
         elif "." in value:
             fields[key] = float(value)  # Float field
         else:
             try:
-                fields[key] = int(value)  # Integer field
+                fields[key] = int(value[:-1] if value[-1] == "i" else value)  # Integer field
             except ValueError:
                 fields[key] = value  # Fallback to string if not an int
 
     # Extract timestamp if present
-    if len(parts) > 2:
-        time = int(parts[2])
-    else:
-        time = None
+    time = int(line[fields_end + 1 :]) if fields_end < len(line) else None
 
     return {"measurement": measurement, "tags": tags, "fields": fields, "time": time}
 
 
-@dataclass
+def escape_value(value):
+    """Escape the spaces of a string value for the line protocol."""
+    return value.replace(" ", r"\ ") if isinstance(value, str) else value
+
+
+def escape_tag(value):
+    """Escape the spaces, commas and equal signs of a string tag value for the line protocol."""
+    if isinstance(value, str):
+        return value.replace(" ", r"\ ").replace(",", r"\,").replace("=", r"\=")
+    return value
+
+
+def format_field(key, value) -> str:
+    """Format a field of a type without a specific formatter."""
+    return f"{key}={value}"
+
+
+# Line protocol formatter per field value type, looked up by exact type so `bool` is not formatted as `int`
+FIELD_FORMATTERS = {
+    bool: lambda key, value: f"{key}=true" if value else f"{key}=false",
+    int: lambda key, value: f"{key}={value}i",
+    float: format_field,
+    str: lambda key, value: f'{key}="{escape_value(value)}"',
+}
+
+
+@dataclass(slots=True)
 class InfluxMetric:
     measurement: str
     tags: dict
@@ -93,28 +129,11 @@ class InfluxMetric:
     time: Optional[int] = None
 
     def __str__(self):
-        tags_string = ""
-        for key, value in self.tags.items():
-            if value is not None:
-                if isinstance(value, str):
-                    value = value.replace(" ", r"\ ")
-                tags_string += f",{key}={value}"
-
-        fields_string = ""
-        for key, value in self.fields.items():
-            if fields_string:
-                fields_string += ","
-            if isinstance(value, bool):
-                fields_string += f"{key}=true" if value else f"{key}=false"
-            elif isinstance(value, (int)):
-                fields_string += f"{key}={value}i"
-            elif isinstance(value, (float)):
-                fields_string += f"{key}={value}"
-            elif isinstance(value, str):
-                value = value.replace(" ", r"\ ")
-                fields_string += f'{key}="{value}"'
-            else:
-                fields_string += f"{key}={value}"
+        # The tags are already escaped, the parsed ones as they come from Telegraf and the added ones when set
+        tags_string = "".join(f",{key}={value}" for key, value in self.tags.items() if value is not None)
+        fields_string = ",".join(
+            FIELD_FORMATTERS.get(type(value), format_field)(key, value) for key, value in self.fields.items()
+        )
 
         return (
             f"{self.measurement}{tags_string} {fields_string} {self.time}"
@@ -123,61 +142,129 @@ class InfluxMetric:
         )
 
 
-def get_device_data(device_name) -> Optional[dict]:
-    """Retrieve device data from Nautobot GraphQL API if available."""
-    # Retrieve the device data from Nautobot GraphQL API
+def get_devices_data(device_names: list[str]) -> Optional[dict[str, dict]]:
+    """Retrieve the data of several devices from Nautobot GraphQL API in one query, keyed by device name."""
+    # Retrieve the devices data from Nautobot GraphQL API
     try:
-        response = requests.post(
+        response = nautobot_session.post(
             url=f"{NAUTOBOT_URL}/api/graphql/",
-            headers={"Authorization": f"Token {NAUTOBOT_SUPERUSER_API_TOKEN}"},
-            json={
-                "query": NAUTOBOT_DEVICE_GQL,
-                "variables": {"device_name": device_name},
-            },
+            data=orjson.dumps(
+                {
+                    "query": NAUTOBOT_DEVICE_GQL,
+                    "variables": {"device_name": device_names},
+                }
+            ),
         )
     except ConnectionError:
         print("[ERROR] Unable to connect to Nautobot GraphQL API", file=sys.stderr, flush=True)
         return None
 
-    # Return the device data
-    if response.json()["data"]["devices"]:
-        return response.json()["data"]["devices"][0]
-    else:
-        print(f"[WARNING] Device `{device_name}` data not found in {NAUTOBOT_URL}", file=sys.stderr, flush=True)
+    # Nautobot reports GraphQL errors with a 200 status code, so check both
+    payload = orjson.loads(response.content) if response.status_code == 200 else {}
+    if not payload.get("data") or payload.get("errors"):
+        errors = payload.get("errors") or response.reason
+        print(f"[ERROR] Unable to retrieve devices data from Nautobot: {errors}", file=sys.stderr, flush=True)
         return None
 
+    # Return the devices data
+    devices_data = {device["name"]: device for device in payload["data"]["devices"]}
+    for device_name in device_names:
+        if device_name not in devices_data:
+            print(f"[WARNING] Device `{device_name}` data not found in {NAUTOBOT_URL}", file=sys.stderr, flush=True)
+    return devices_data
+
+
+def get_interface_roles(device_names: list[str]) -> dict[str, Optional[dict[str, str]]]:
+    """Return the interface roles by interface name of the devices.
+
+    Nautobot is only queried for the devices not retrieved within the cache TTL.
+    """
+    now = time.monotonic()
+    expired = [
+        name for name in device_names if name not in device_cache or now - device_cache[name][0] >= DEVICE_CACHE_TTL
+    ]
+    if expired:
+        devices_data = get_devices_data(expired)
+        # Nautobot not reachable, keep the previous data (if any) and try again with the next batch
+        if devices_data is not None:
+            for name in expired:
+                device_data = devices_data.get(name)
+                interface_roles = (
+                    {interface["name"]: interface["label"] for interface in device_data["interfaces"]}
+                    if device_data
+                    else None
+                )
+                device_cache[name] = (now, interface_roles)
+    return {name: device_cache[name][1] for name in device_names if name in device_cache}
+
+
+def read_batches(max_lines: int = 200, max_wait: float = 0.05):
+    """Yield the lines of input in batches.
+
+    A batch is closed once it has `max_lines` lines or `max_wait` seconds after its first line, so
+    the metrics are still streamed back to Telegraf without noticeable delay.
+    """
+    stdin_fd = sys.stdin.fileno()
+    pending = b""
+    batch = []
+    deadline = None
+    while True:
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        ready, _, _ = select.select([stdin_fd], [], [], timeout)
+        if ready:
+            chunk = os.read(stdin_fd, 65536)
+            if not chunk:
+                # Telegraf closed the input, flush what is left and stop
+                if pending:
+                    batch.append(pending.decode())
+                if batch:
+                    yield batch
+                return
+
+            # Keep the last, incomplete, line for the next read
+            *lines, pending = (pending + chunk).split(b"\n")
+            batch.extend(line.decode() for line in lines if line)
+            if batch and deadline is None:
+                deadline = time.monotonic() + max_wait
+
+        if batch and (not ready or len(batch) >= max_lines or time.monotonic() >= deadline):
+            yield batch
+            batch = []
+            deadline = None
+
 
 def main():
-    # Iterate over the lines of input
-    for line in fileinput.input():
-        # Parse the line into an InfluxMetric object
-        influx_metric = InfluxMetric(**parse_line(line))
-
-        # Extract the device name from the tags
-        device_name = influx_metric.tags.get("device")
-        if not device_name:
-            # Print metric even if device_name is not available
-            print(influx_metric, flush=True)
-            continue
-
-        # Retrieve device data from Nautobot
-        device_data = get_device_data(device_name)
-        if not device_data:
-            # Print metric even if device data is not available
-            print(influx_metric, flush=True)
-            continue
-
-        # Create JMESPath expressions to extract and interface data from the device
-        jpath = f"interfaces[?name=='{influx_metric.tags['name']}'].label"
-
-        # Extract the interface label from the device data
-        intf_role = jmespath.search(jpath, device_data)[0]
-
-        # Add the interface role to the tags
-        influx_metric.tags["intf_role"] = intf_role
-
-        # Print the line protocol string
-        print(influx_metric, flush=True)
+    # Iterate over the lines of input, in batches
+    for lines in read_batches():
+        # Parse the lines into InfluxMetric objects, a line that can not be parsed is left as None
+        parsed_metrics = []
+        for line in lines:
+            try:
+                parsed_metrics.append(InfluxMetric(**parse_line(line)))
+            except (AttributeError, ValueError) as err:
+                print(f"[WARNING] Unable to parse line `{line}`: {err}", file=sys.stderr, flush=True)
+                parsed_metrics.append(None)
+        influx_metrics = [influx_metric for influx_metric in parsed_metrics if influx_metric is not None]
+
+        # Retrieve the data of all the devices of the batch from Nautobot at once
+        device_names = sorted({metric.tags["device"] for metric in influx_metrics if metric.tags.get("device")})
+        interface_roles = get_interface_roles(device_names) if device_names else {}
+
+        for influx_metric in influx_metrics:
+            device_interface_roles = interface_roles.get(influx_metric.tags.get("device"))
+            if device_interface_roles:
+                # Add the interface role to the tags, it is left out if the interface is not found
+                influx_metric.tags["intf_role"] = escape_tag(device_interface_roles.get(influx_metric.tags.get("name")))
+
+        # Write the line protocol strings of the whole batch at once, even for metrics without device data, and
+        # the lines that could not be parsed unchanged
+        sys.stdout.write(
+            "".join(
+                f"{line if influx_metric is None else influx_metric}\n"
+                for line, influx_metric in zip(lines, parsed_metrics)
+            )
+        )
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
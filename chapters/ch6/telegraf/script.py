@@ -1,3 +1,14 @@
+import re
+
+# Line protocol tokens, `\\.` keeps a backslash escaped character (space, comma, equal sign, quote) in its token
+# Measurement and tags of a line, up to the first unescaped space
+SERIES_RE = re.compile(r"((?:\\.|[^ ,\\])+)(?:,(?:\\.|[^ \\])+)?")
+# `key=value` pair of the tags and fields, a quoted string value may contain commas, spaces and escaped quotes
+KEY_VALUE_RE = re.compile(r'((?:\\.|[^,=\\])+)=("(?:\\.|[^"\\])*"|(?:\\.|[^,=\\])+)')
+# Fields of a line, up to the first unescaped space outside of a quoted string value
+FIELDS_RE = re.compile(r'(?:"(?:\\.|[^"\\])*"|\\.|[^ "\\])+')
+
+
 def parse_line(line: str) -> dict:
     """
     Parse a line of InfluxDB Line Protocol and return a dictionary with the
@@ -9,44 +20,32 @@ def parse_line(line: str) -> dict:
     Returns:
         dict: Dictionary with measurement, tags, fields, and optional time
     """
-    # Split the line into main components: measurement+tags, fields, and optional time
-    parts = line.split(" ")
-
-    # Extract measurement and tags
-    measurement_and_tags = parts[0]
-    if "," in measurement_and_tags:
-        measurement, tags_str = measurement_and_tags.split(",", 1)
-    else:
-        measurement = measurement_and_tags
-        tags_str = ""
-
-    # Parse tags
-    tags = {}
-    if tags_str:
-        for tag in tags_str.split(","):
-            key, value = tag.split("=")
-            tags[key] = value
+    line = line.rstrip("\n")
+
+    # Find the main components in a single pass: measurement+tags, fields, and optional time
+    series = SERIES_RE.match(line)
+    tags_end = series.end()
+    fields_end = FIELDS_RE.match(line, tags_end + 1).end()
+
+    # Extract measurement and tags, the tag values are kept escaped as they are written back as is
+    measurement = series[1]
+    tags = {match[1]: match[2] for match in KEY_VALUE_RE.finditer(line, series.end(1) + 1, tags_end)}
 
     # Extract and parse fields
-    fields_str = parts[1]
     fields = {}
-    for field in fields_str.split(","):
-        key, value = field.split("=")
+    for key, value in KEY_VALUE_RE.findall(line, tags_end + 1, fields_end):
         # Determine field type
-        if value.startswith('"') and value.endswith('"'):
+        if value[0] == '"' and value[-1] == '"':
             fields[key] = value[1:-1]  # String field
         elif "." in value:
             fields[key] = float(value)  # Float field
         else:
             try:
-                fields[key] = int(value)  # Integer field
+                fields[key] = int(value[:-1] if value[-1] == "i" else value)  # Integer field
             except ValueError:
                 fields[key] = value  # Fallback to string if not an int
 
     # Extract timestamp if present
-    if len(parts) > 2:
-        time = int(parts[2])
-    else:
-        time = None
+    time = int(line[fields_end + 1 :]) if fields_end < len(line) else None
 
     return {"measurement": measurement, "tags": tags, "fields": fields, "time": time}
@@ -3,14 +3,18 @@
 import os
 import shlex
 import subprocess  # nosec
+import sys
 import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from subprocess import CompletedProcess  # nosec
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 from urllib.parse import urlparse
 
-import netmiko
+import orjson
 import requests
 import typer
 import yaml
@@ -21,12 +25,46 @@ from rich.console import Console
 from rich.theme import Theme
 from typing_extensions import Annotated
 
+# Loaded at import, so the typer options with an `envvar` pick up the values of the .env file
 load_dotenv(verbose=True, override=True, dotenv_path=Path("./.env"))
-ENVVARS = {**dotenv_values(".env"), **dotenv_values(".setup.env"), **os.environ}
+
+
+class LazyEnvVars(Mapping):
+    """Environment variables of the .env and .setup.env files and the OS, only read when first needed."""
+
+    def __init__(self):
+        self._envvars: dict[str, Any] | None = None
+
+    @property
+    def envvars(self) -> dict[str, Any]:
+        if self._envvars is None:
+            envvars = {**dotenv_values(".env"), **dotenv_values(".setup.env"), **os.environ}
+            # Drop the variables declared without a value, the subprocess environment only takes strings
+            self._envvars = {key: value for key, value in envvars.items() if value is not None}
+        return self._envvars
+
+    def __getitem__(self, key: str) -> Any:
+        return self.envvars[key]
+
+    def __iter__(self):
+        return iter(self.envvars)
+
+    def __len__(self) -> int:
+        return len(self.envvars)
+
+
+ENVVARS = LazyEnvVars()
 
 custom_theme = Theme({"info": "cyan", "warning": "bold magenta", "error": "bold red", "good": "bold green"})
 
-console = Console(color_system="truecolor", log_path=False, record=True, theme=custom_theme, force_terminal=True)
+# Only force the colors on a terminal, so the output piped to a file or a log collector has no escape codes
+IS_TTY = sys.stdout.isatty()
+console = Console(
+    color_system="truecolor" if IS_TTY else None,
+    log_path=False,
+    theme=custom_theme,
+    force_terminal=IS_TTY,
+)
 
 app = typer.Typer(help="Run commands for setup and testing", rich_markup_mode="rich", add_completion=False)
 containerlab_app = typer.Typer(help="Containerlab related commands.", rich_markup_mode="rich")
@@ -65,6 +103,11 @@ class NetObsScenarios(Enum):
     CH13 = "ch13"
     CH13_COMPLETED = "ch13-completed"
 
+    @property
+    def compose_file(self) -> Path:
+        """Docker compose file of the scenario."""
+        return Path(f"./chapters/{self.value}/docker-compose.yml")
+
 
 class DockerNetworkAction(Enum):
     """Docker network action."""
@@ -78,6 +121,15 @@ class DockerNetworkAction(Enum):
     REMOVE = "rm"
 
 
+# Retry schedule of the Nautobot API calls. POST and PATCH are retried too, the bulk endpoints use them
+NAUTOBOT_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"}),
+)
+
+
 class NautobotClient:
     def __init__(
         self,
@@ -91,6 +143,8 @@ class NautobotClient:
         self.retries = kwargs.get("retries", 3)
         self.timeout = kwargs.get("timeout", 10)
         self.proxies = kwargs.get("proxies", None)
+        self.pool_connections = kwargs.get("pool_connections", 10)
+        self.pool_maxsize = kwargs.get("pool_maxsize", 20)
         self._create_session()
 
     def _parse_url(self, url: str) -> str:
@@ -118,12 +172,14 @@ class NautobotClient:
         if self.proxies:
             self.session.proxies.update(self.proxies)
 
-        retry_method = Retry(
-            total=self.retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+        retry_method = NAUTOBOT_RETRY.new(total=self.retries)
+        # Keep a pool of connections alive, so consecutive calls do not open a new connection each time
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=False,
+            max_retries=retry_method,
         )
-        adapter = HTTPAdapter(max_retries=retry_method)
 
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
@@ -133,7 +189,7 @@ class NautobotClient:
         method: str,
         url: str,
         data: dict | str | None = None,
-        json_data: dict | None = None,
+        json_data: dict | list[dict] | None = None,
         headers: dict | None = None,
         verify: bool = False,
         params: dict | list[tuple] | None = None,
@@ -152,11 +208,14 @@ class NautobotClient:
         - `verify`: SSL Verification
         - `params`: Dictionary or bytes to be sent in the query string for the Request
         """
+        # Serialize the JSON body with orjson, the session already sends the JSON Content-Type
+        if json_data is not None:
+            data = orjson.dumps(json_data)
+
         _request = requests.Request(
             method=method.upper(),
             url=self.base_url + url,
             data=data,
-            json=json_data,
             headers=headers,
             params=params,
         )
@@ -183,7 +242,96 @@ class NautobotClient:
 
         if _response.status_code == 204:
             return {}
-        return _response.json()
+        return orjson.loads(_response.content)
+
+    def http_get_all(self, url: str, page_size: int = 1000) -> list[dict]:
+        """
+        Retrieves all the objects of a list endpoint, following the pagination
+
+        **Required Attributes:**
+
+        - `url` (str): URL target (**required**)
+        - `page_size`: Number of objects per page
+        """
+        results = []
+        while True:
+            response = self.http_call(
+                method="get",
+                url=url,
+                params={"limit": page_size, "offset": len(results), "depth": 0},
+            )
+            results.extend(response["results"])
+            if not response["next"] or not response["results"]:
+                return results
+
+    def http_call_many(
+        self,
+        method: str,
+        url: str,
+        items: list[dict],
+        chunk_size: int = 100,
+    ) -> list[dict]:
+        """
+        Performs the HTTP operation actioned on several objects at once, using the Nautobot bulk endpoints
+
+        The items are sent as JSON arrays of up to `chunk_size` objects, falling back to one call per item
+        when the endpoint rejects the array. The returned objects are in the same order as the items.
+        Every item is sent even if some are rejected, the rejected items are logged and the first error is
+        raised once all the items have been actioned.
+
+        **Required Attributes:**
+
+        - `method` (enum): HTTP method to perform: post, put, patch, delete (**required**)
+        - `url` (str): URL target (**required**)
+        - `items`: List of dicts to be passed as JSON array (**required**)
+        - `chunk_size`: Maximum number of items per request
+        """
+        results = []
+        errors = []
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start : start + chunk_size]
+            try:
+                responses = [self.http_call(method=method, url=url, json_data=chunk)]
+            except (requests.HTTPError, ValueError) as err:
+                # `http_call` raises a ValueError for the objects that already exist, before the HTTP status check
+                if len(chunk) == 1 or (
+                    isinstance(err, requests.HTTPError) and (err.response is None or err.response.status_code != 400)
+                ):
+                    raise err
+                # Send the items in arrays of one, so the accepted items are still actioned
+                responses = []
+                for item in chunk:
+                    try:
+                        responses.append(self.http_call(method=method, url=url, json_data=[item]))
+                    except (requests.HTTPError, ValueError) as item_err:
+                        console.log(f"Rejected item: {item_err}", item, style="error")
+                        errors.append(item_err)
+            for response in responses:
+                # Bulk delete returns no content
+                if isinstance(response, list):
+                    results.extend(response)
+        if errors:
+            raise errors[0]
+        return results
+
+    def http_call_parallel(self, calls: list[dict], max_workers: int = 16) -> list[dict]:
+        """
+        Performs independent HTTP operations concurrently, sharing the session connection pool
+
+        Each call is a dict of `http_call` keyword arguments. The responses are returned in the same order
+        as the calls, and the first error raised by a call is raised back.
+
+        **Required Attributes:**
+
+        - `calls`: List of dicts with the `http_call` arguments of each call (**required**)
+        - `max_workers`: Maximum number of calls in flight, capped to the connection pool size
+        """
+        with ThreadPoolExecutor(max_workers=min(max_workers, self.pool_maxsize)) as executor:
+            return list(executor.map(lambda call: self.http_call(**call), calls))
+
+
+TRUTHY_VALUES = frozenset({"y", "yes", "t", "true", "on", "1"})
+FALSY_VALUES = frozenset({"n", "no", "f", "false", "off", "0"})
 
 
 def strtobool(val: str) -> bool:
@@ -196,9 +344,9 @@ def strtobool(val: str) -> bool:
         bool: True or False
     """
     val = val.lower()
-    if val in ("y", "yes", "t", "true", "on", "1"):
+    if val in TRUTHY_VALUES:
         return True
-    elif val in ("n", "no", "f", "false", "off", "0"):
+    elif val in FALSY_VALUES:
         return False
     else:
         raise ValueError("invalid truth value %r" % (val,))
@@ -217,11 +365,24 @@ def is_truthy(arg: Any) -> bool:
         arg (str): Truthy string (True values are y, yes, t, true, on and 1; false values are n, no,
         f, false, off and 0. Raises ValueError if val is anything else.
     """
-    if isinstance(arg, bool):
-        return arg
+    # Unset environment variables are the most common input
     if arg is None:
         return False
-    return bool(strtobool(arg))
+    if isinstance(arg, bool):
+        return arg
+    return strtobool(arg)
+
+
+@lru_cache(maxsize=None)
+def docker_compose_executable() -> tuple[str, ...]:
+    """Return the docker compose executable, `docker-compose` or the `docker compose` plugin, resolved once.
+
+    Returns:
+        tuple[str, ...]: Docker compose command arguments
+    """
+    if is_truthy(ENVVARS.get("DOCKER_COMPOSE_WITH_HASH", None)):
+        return ("docker-compose",)
+    return ("docker", "compose")
 
 
 def docker_compose_cmd(
@@ -232,7 +393,7 @@ def docker_compose_cmd(
     extra_options: str = "",
     command: str = "",
     compose_name: str = "",
-) -> str:
+) -> list[str]:
     """Create docker-compose command to execute.
 
     Args:
@@ -245,30 +406,27 @@ def docker_compose_cmd(
         compose_name (str, optional): Name to give to the docker compose project. Defaults to PROJECT_NAME.
 
     Returns:
-        str: Docker compose command
+        list[str]: Docker compose command arguments
     """
-    if is_truthy(ENVVARS.get("DOCKER_COMPOSE_WITH_HASH", None)):
-        exec_cmd = f"docker-compose --project-name {compose_name} -f {docker_compose_file}"
-    else:
-        exec_cmd = f"docker compose --project-name {compose_name} -f {docker_compose_file}"
+    exec_cmd = [*docker_compose_executable(), "--project-name", compose_name, "-f", str(docker_compose_file)]
 
     if verbose:
-        exec_cmd += " --verbose"
-    exec_cmd += f" {compose_action}"
+        exec_cmd.append("--verbose")
+    exec_cmd.append(compose_action)
 
     if extra_options:
-        exec_cmd += f" {extra_options}"
+        exec_cmd.extend(shlex.split(extra_options))
     if services:
-        exec_cmd += f" {' '.join(services)}"
+        exec_cmd.extend(services)
     if command:
-        exec_cmd += f" {command}"
+        exec_cmd.extend(shlex.split(command))
 
     return exec_cmd
 
 
 def run_cmd(
-    exec_cmd: str,
-    envvars: dict[str, Any] = ENVVARS,
+    exec_cmd: str | Sequence[str],
+    envvars: Mapping[str, Any] = ENVVARS,
     cwd: Optional[str] = None,
     timeout: Optional[int] = None,
     shell: bool = False,
@@ -278,8 +436,8 @@ def run_cmd(
     """Run a command and return the result.
 
     Args:
-        exec_cmd (str): Command to execute
-        envvars (dict, optional): Environment variables. Defaults to ENVVARS.
+        exec_cmd (str | Sequence[str]): Command to execute, a list of arguments is passed as is to the process
+        envvars (Mapping, optional): Environment variables. Defaults to ENVVARS.
         cwd (str, optional): Working directory. Defaults to None.
         timeout (int, optional): Timeout in seconds. Defaults to None.
         shell (bool, optional): Run the command in a shell. Defaults to False.
@@ -289,9 +447,15 @@ def run_cmd(
     Returns:
         subprocess.CompletedProcess: Result of the command
     """
+    # Only a command string needs to be tokenized
+    if isinstance(exec_cmd, str):
+        exec_args = shlex.split(exec_cmd)
+    else:
+        exec_args = list(exec_cmd)
+        exec_cmd = shlex.join(exec_args)
     console.log(f"Running command: [orange1 i]{exec_cmd}", style="info")
     result = subprocess.run(
-        shlex.split(exec_cmd),
+        exec_args,
         env=envvars,
         cwd=cwd,
         timeout=timeout,
@@ -301,12 +465,14 @@ def run_cmd(
         check=False,
     )
     task_name = task_name if task_name else exec_cmd
-    if result.returncode == 0:
-        console.log(f"Successfully ran: [i]{task_name}", style="good")
-    else:
-        console.log(f"Issues encountered running: [i]{task_name}", style="warning")
-    console.rule(f"End of task: [b i]{task_name}", style="info")
-    console.print()
+    # Buffer the end of task messages and write them at once
+    with console:
+        if result.returncode == 0:
+            console.log(f"Successfully ran: [i]{task_name}", style="good")
+        else:
+            console.log(f"Issues encountered running: [i]{task_name}", style="warning")
+        console.rule(f"End of task: [b i]{task_name}", style="info")
+        console.print()
     return result
 
 
@@ -317,7 +483,7 @@ def run_docker_compose_cmd(
     verbose: int = 0,
     command: str = "",
     extra_options: str = "",
-    envvars: dict[str, Any] = ENVVARS,
+    envvars: Mapping[str, Any] = ENVVARS,
     timeout: Optional[int] = None,
     shell: bool = False,
     capture_output: bool = False,
@@ -332,7 +498,7 @@ def run_docker_compose_cmd(
         verbose (int, optional): Execute verbose command. Defaults to 0.
         command (str, optional): Docker compose command to send on action `exec`. Defaults to "".
         extra_options (str, optional): Extra options to pass over docker compose command. Defaults to "".
-        envvars (dict, optional): Environment variables. Defaults to ENVVARS.
+        envvars (Mapping, optional): Environment variables. Defaults to ENVVARS.
         timeout (int, optional): Timeout in seconds. Defaults to None.
         shell (bool, optional): Run the command in a shell. Defaults to False.
         capture_output (bool, optional): Capture stdout and stderr. Defaults to True.
@@ -369,6 +535,10 @@ def run_docker_compose_cmd(
 # --------------------------------------#
 
 
+# Use the libyaml based loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def load_yaml(topology: Path) -> dict:
     """Read a containerlab topology file.
 
@@ -380,7 +550,7 @@ def load_yaml(topology: Path) -> dict:
     """
     with open(topology, "r") as stream:
         try:
-            topology_dict = yaml.safe_load(stream)
+            topology_dict = yaml.load(stream, Loader=YAML_LOADER)  # nosec
         except yaml.YAMLError as exc:
             console.log(exc, style="error")
             raise typer.Exit(1) from exc
@@ -399,9 +569,9 @@ def containerlab_deploy(
     """
     console.log("Deploying containerlab topology", style="info")
     console.log(f"Topology file: [orange1 i]{topology}", style="info")
-    exec_cmd = f"containerlab deploy -t {topology}"
+    exec_cmd = ["containerlab", "deploy", "-t", str(topology)]
     if sudo:
-        exec_cmd = f"sudo {exec_cmd}"
+        exec_cmd = ["sudo", *exec_cmd]
     run_cmd(exec_cmd, task_name="Deploying containerlab topology")
 
 
@@ -417,9 +587,9 @@ def containerlab_destroy(
     """
     console.log("Deploying containerlab topology", style="info")
     console.log(f"Topology file: [orange1 i]{topology}", style="info")
-    exec_cmd = f"containerlab destroy -t {topology} --cleanup"
+    exec_cmd = ["containerlab", "destroy", "-t", str(topology), "--cleanup"]
     if sudo:
-        exec_cmd = f"sudo {exec_cmd}"
+        exec_cmd = ["sudo", *exec_cmd]
     run_cmd(exec_cmd, task_name="Destroying containerlab topology")
 
 
@@ -435,9 +605,9 @@ def containerlab_inspect(
     """
     console.log("Showing containerlab topology", style="info")
     console.log(f"Topology file: [orange1 i]{topology}", style="info")
-    exec_cmd = f"containerlab inspect -t {topology}"
+    exec_cmd = ["containerlab", "inspect", "-t", str(topology)]
     if sudo:
-        exec_cmd = f"sudo {exec_cmd}"
+        exec_cmd = ["sudo", *exec_cmd]
     run_cmd(exec_cmd, task_name="Inspect containerlab topology")
 
 
@@ -467,7 +637,7 @@ def docker_build(
     console.log(f"Building service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="build",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         task_name="build stack",
@@ -496,7 +666,7 @@ def docker_exec(
     console.log(f"Executing command in service: [orange1 i]{service}", style="info")
     run_docker_compose_cmd(
         action="exec",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=[service],
         command=command,
         verbose=verbose,
@@ -525,7 +695,7 @@ def docker_debug(
     console.log(f"Starting in debug mode service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="up",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         extra_options="--remove-orphans",
@@ -554,7 +724,7 @@ def docker_start(
     console.log(f"Starting service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="up",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         extra_options="-d --remove-orphans",
@@ -583,7 +753,7 @@ def docker_stop(
     console.log(f"Stopping service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="stop",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         task_name="stop stack",
@@ -611,7 +781,7 @@ def docker_restart(
     console.log(f"Restarting service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="restart",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         task_name="restart stack",
@@ -649,7 +819,7 @@ def docker_logs(
         options += f"--tail={tail}"
     run_docker_compose_cmd(
         action="logs",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         extra_options=options,
         verbose=verbose,
@@ -678,7 +848,7 @@ def docker_ps(
     console.log(f"Showing containers for service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="ps",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         task_name="show containers",
@@ -713,7 +883,7 @@ def docker_destroy(
     console.log(f"Destroying service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="down",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         extra_options="--volumes --remove-orphans" if volumes else "--remove-orphans",
@@ -761,7 +931,7 @@ def docker_rm(
     console.log(f"Removing service(s): [orange1 i]{services}", style="info")
     run_docker_compose_cmd(
         action="rm",
-        filename=Path(f"./chapters/{scenario.value}/docker-compose.yml"),
+        filename=scenario.compose_file,
         services=services if services else [],
         verbose=verbose,
         extra_options=extra_options,
@@ -779,13 +949,13 @@ def docker_network(
 ):
     """Manage docker network."""
     console.log(f"Network {action.value}: [orange1 i]{name}", style="info")
-    exec_cmd = f"docker network {action.value}"
+    exec_cmd = ["docker", "network", action.value]
     if driver and action.value == "create":
-        exec_cmd += f" --driver={driver} "
+        exec_cmd.append(f"--driver={driver}")
     if subnet and action.value == "create":
-        exec_cmd += f" --subnet={subnet}"
+        exec_cmd.append(f"--subnet={subnet}")
     if action.value != "ls" and action.value != "prune":
-        exec_cmd += f" {name}"
+        exec_cmd.append(name)
     run_cmd(
         exec_cmd=exec_cmd,
         task_name=f"network {action.value}",
@@ -823,7 +993,8 @@ def lab_deploy(
         verbose=True,
     )
 
-    # Deploy containerlab topology
+    # Deploy containerlab topology first, its nodes have static addresses on the network and the docker
+    # compose services expect them to be up
     containerlab_deploy(topology=topology, sudo=sudo)
 
     # Start docker compose
@@ -862,13 +1033,16 @@ def lab_purge(
     console.rule("[b i]PURGING ALL LAB ENVIRONMENTS", style="error")
     console.log("Purging lab environments", style="info")
 
-    # Iterate over all scenarios and destroy them
+    # Iterate over all scenarios and destroy their docker compose stack
     for scenario in NetObsScenarios:
         try:
-            lab_destroy(scenario=scenario, sudo=sudo)
+            docker_destroy(scenario=scenario, services=[], volumes=True, verbose=True)
         except typer.Exit:
             pass
 
+    # All the scenarios use the same containerlab topology, so it only needs to be destroyed once
+    containerlab_destroy(topology=Path("./containerlab/lab.yml"), sudo=sudo)
+
     console.rule("[b i]LAB ENVIRONMENTS PURGED", style="error")
 
 
@@ -989,7 +1163,7 @@ def ansible_command(
     limit: str | None = None,
     extra_vars: str | None = None,
     verbose: int = 0,
-) -> str:
+) -> list[str]:
     """Run an ansible playbook with the given inventories and limit.
 
     Args:
@@ -999,21 +1173,21 @@ def ansible_command(
         verbose (int, optional): The verbosity level. Defaults to 0.
 
     Returns:
-        str: The ansible command to run.
+        list[str]: The ansible command arguments to run.
     """
-    exec_cmd = f"ansible-playbook setup/{playbook}"
+    exec_cmd = ["ansible-playbook", f"setup/{playbook}"]
     if inventories:
         for inventory in inventories:
-            exec_cmd += f" -i setup/inventory/{inventory}"
+            exec_cmd.extend(["-i", f"setup/inventory/{inventory}"])
 
     if limit:
-        exec_cmd += f" -l {limit}"
+        exec_cmd.extend(["-l", limit])
 
     if extra_vars:
-        exec_cmd += f' -e "{extra_vars}"'
+        exec_cmd.extend(["-e", extra_vars])
 
     if verbose:
-        exec_cmd += f" -{'v' * verbose}"
+        exec_cmd.append(f"-{'v' * verbose}")
 
     return exec_cmd
 
@@ -1110,6 +1284,150 @@ def show_droplet():
 # --------------------------------------#
 
 
+def create_nautobot_base_objects(nautobot_client: NautobotClient) -> dict[str, dict]:
+    """Create the objects the lab devices and IPAM data depend on (role, statuses, location, namespace, ...).
+
+    Args:
+        nautobot_client (NautobotClient): Nautobot client
+
+    Returns:
+        dict[str, dict]: Created objects by name
+    """
+    # Create the objects that do not depend on each other at the same time
+    roles, manufacturers, location_type, statuses, alerted_statuses, ipam_namespace = (
+        nautobot_client.http_call_parallel(
+            [
+                # Roles
+                {
+                    "url": "/api/extras/roles/",
+                    "method": "post",
+                    "json_data": {"name": "network_device", "content_types": ["dcim.device"]},
+                },
+                # Manufacturers
+                {
+                    "url": "/api/dcim/manufacturers/",
+                    "method": "post",
+                    "json_data": {"name": "Arista"},
+                },
+                # Location Types
+                {
+                    "url": "/api/dcim/location-types/",
+                    "method": "post",
+                    "json_data": {"name": "site", "content_types": ["dcim.device"]},
+                },
+                # Statuses
+                {
+                    "url": "/api/extras/statuses/",
+                    "method": "post",
+                    "json_data": {
+                        "name": "lab-active",
+                        "content_types": [
+                            "dcim.device",
+                            "dcim.interface",
+                            "dcim.location",
+                            "ipam.ipaddress",
+                            "ipam.prefix",
+                        ],
+                        "color": "aaf0d1",
+                    },
+                },
+                {
+                    "url": "/api/extras/statuses/",
+                    "method": "post",
+                    "json_data": {
+                        "name": "Alerted",
+                        "content_types": [
+                            "dcim.device",
+                            "dcim.interface",
+                            "dcim.location",
+                            "ipam.ipaddress",
+                            "ipam.prefix",
+                        ],
+                        "color": "ff5a36",
+                    },
+                },
+                # IPAM Namespace
+                {
+                    "url": "/api/ipam/namespaces/",
+                    "method": "post",
+                    "json_data": {"name": "lab-default"},
+                },
+            ]
+        )
+    )
+    console.log(f"Created Role: [orange1 i]{roles['display']}", style="info")
+    console.log(f"Created Manufacturer: [orange1 i]{manufacturers['display']}", style="info")
+    console.log(f"Created Location Type: [orange1 i]{location_type['display']}", style="info")
+    console.log(f"Created Status: [orange1 i]{statuses['display']}", style="info")
+    console.log(f"Created Status: [orange1 i]{alerted_statuses['display']}", style="info")
+    console.log(f"Created IPAM Namespace: [orange1 i]{ipam_namespace['display']}", style="info")
+
+    # Create Device Types and Locations, which depend on the Manufacturer, Location Type and Status
+    device_types, locations = nautobot_client.http_call_parallel(
+        [
+            {
+                "url": "/api/dcim/device-types/",
+                "method": "post",
+                "json_data": {"manufacturer": "Arista", "model": "cEOS"},
+            },
+            {
+                "url": "/api/dcim/locations/",
+                "method": "post",
+                "json_data": {
+                    "name": "lab",
+                    "location_type": {"id": location_type["id"]},
+                    "status": {"id": statuses["id"]},
+                },
+            },
+        ]
+    )
+    console.log(f"Created Device Types: [orange1 i]{device_types['display']}", style="info")
+    console.log(f"Created Location: [orange1 i]{locations['display']}", style="info")
+
+    return {
+        "roles": roles,
+        "manufacturers": manufacturers,
+        "location_type": location_type,
+        "statuses": statuses,
+        "alerted_statuses": alerted_statuses,
+        "ipam_namespace": ipam_namespace,
+        "device_types": device_types,
+        "locations": locations,
+    }
+
+
+def bulk_create_nautobot_objects(
+    nautobot_client: NautobotClient,
+    url: str,
+    items: list[dict],
+    name: str,
+    names: str,
+    method: str = "post",
+    verbose: bool = False,
+) -> list[dict]:
+    """Create (or update) objects in Nautobot with bulk requests, and log how many were actioned.
+
+    Args:
+        nautobot_client (NautobotClient): Nautobot client
+        url (str): Nautobot API endpoint of the objects
+        items (list[dict]): Objects to send
+        name (str): Name of an object for the logs. ex: "IP Address"
+        names (str): Name of the objects for the logs. ex: "IP Addresses"
+        method (str, optional): HTTP method, post to create and patch to update. Defaults to "post".
+        verbose (bool, optional): Log every object. Defaults to False.
+
+    Returns:
+        list[dict]: Objects returned by Nautobot, in the same order as the items
+    """
+    action = "Updated" if method == "patch" else "Created"
+    nautobot_objects = nautobot_client.http_call_many(url=url, method=method, items=items)
+    if verbose:
+        for nautobot_object in nautobot_objects:
+            console.log(f"{action} {name}: [orange1 i]{nautobot_object['display']}", style="info")
+    console.log(f"{action} {names}: [orange1 i]{len(nautobot_objects)}", style="info")
+    return nautobot_objects
+
+
 @utils_app.command("load-nautobot", rich_help_panel="Nautobot")
 def utils_load_nautobot_data(
     nautobot_token: Annotated[str, typer.Option(help="Nautobot Token", envvar="NAUTOBOT_SUPERUSER_API_TOKEN")],
@@ -1120,6 +1438,7 @@ def utils_load_nautobot_data(
         "./containerlab/lab_vars.yml"
     ),
     nautobot_url: Annotated[str, typer.Option(help="Nautobot URL", envvar="NAUTOBOT_URL")] = "http://localhost:8080",
+    verbose: Annotated[bool, typer.Option(help="Log every object created")] = False,
 ):
     """Load Nautobot data from containerlab topology file."""
     console.log(
@@ -1129,129 +1448,57 @@ def utils_load_nautobot_data(
     console.log("Reading containerlab topology file", style="info")
     topology_dict = load_yaml(topology)
 
-    # Add extra vars to topology dict
+    # Merge the extra vars of each node into its topology data, in a single pass over the nodes
     extra_topology_vars_dict = load_yaml(extra_topology_vars)
-    for key, value in extra_topology_vars_dict["nodes"].items():
-        topology_dict["topology"]["nodes"][key].update(value)
+    extra_nodes_vars = extra_topology_vars_dict["nodes"]
+    nodes = {
+        node: {**node_data, **extra_nodes_vars.get(node, {})}
+        for node, node_data in topology_dict["topology"]["nodes"].items()
+    }
 
     # Instantiate Nautobot Client
     console.log("Instantiating Nautobot Client", style="info")
     nautobot_client = NautobotClient(url=nautobot_url, token=nautobot_token)
 
-    # Create Roles in Nautobot
-    roles = nautobot_client.http_call(
-        url="/api/extras/roles/",
-        method="post",
-        json_data={"name": "network_device", "content_types": ["dcim.device"]},
-    )
-    console.log(f"Created Role: [orange1 i]{roles['display']}", style="info")
-
-    # Create Manufacturers in Nautobot
-    manufacturers = nautobot_client.http_call(
-        url="/api/dcim/manufacturers/",
-        method="post",
-        json_data={"name": "Arista"},
-    )
-    console.log(f"Created Manufacturer: [orange1 i]{manufacturers['display']}", style="info")
-
-    # Create Device Types in Nautobot
-    device_types = nautobot_client.http_call(
-        url="/api/dcim/device-types/",
-        method="post",
-        json_data={"manufacturer": "Arista", "model": "cEOS"},
-    )
-    console.log(f"Created Device Types: [orange1 i]{device_types['display']}", style="info")
-
-    # Create Location Types
-    location_type = nautobot_client.http_call(
-        url="/api/dcim/location-types/",
-        method="post",
-        json_data={"name": "site", "content_types": ["dcim.device"]},
-    )
-    console.log(f"Created Location Type: [orange1 i]{location_type['display']}", style="info")
-
-    # Create Statuses
-    statuses = nautobot_client.http_call(
-        url="/api/extras/statuses/",
-        method="post",
-        json_data={
-            "name": "lab-active",
-            "content_types": ["dcim.device", "dcim.interface", "dcim.location", "ipam.ipaddress", "ipam.prefix"],
-            "color": "aaf0d1",
-        },
-    )
-    console.log(f"Created Status: [orange1 i]{statuses['display']}", style="info")
-    alerted_statuses = nautobot_client.http_call(
-        url="/api/extras/statuses/",
-        method="post",
-        json_data={
-            "name": "Alerted",
-            "content_types": ["dcim.device", "dcim.interface", "dcim.location", "ipam.ipaddress", "ipam.prefix"],
-            "color": "ff5a36",
-        },
-    )
-    console.log(f"Created Status: [orange1 i]{alerted_statuses['display']}", style="info")
-
-    # Create Locations
-    locations = nautobot_client.http_call(
-        url="/api/dcim/locations/",
-        method="post",
-        json_data={
-            "name": "lab",
-            "location_type": {"id": location_type["id"]},
-            "status": {"id": statuses["id"]},
-        },
-    )
-    console.log(f"Created Location: [orange1 i]{locations['display']}", style="info")
-
-    # Create IPAM Namespace
-    ipam_namespace = nautobot_client.http_call(
-        url="/api/ipam/namespaces/",
-        method="post",
-        json_data={"name": "lab-default"},
-    )
-    console.log(f"Created IPAM Namespace: [orange1 i]{ipam_namespace['display']}", style="info")
-
-    # Create Prefixes for the Namespace
-    for prefix_data in extra_topology_vars_dict["prefixes"]:
-        prefix = nautobot_client.http_call(
-            url="/api/ipam/prefixes/",
-            method="post",
-            json_data={
-                "prefix": prefix_data["prefix"],
+    # Create the objects the devices and IPAM data depend on
+    base_objects = create_nautobot_base_objects(nautobot_client)
+    statuses = base_objects["statuses"]
+    ipam_namespace = base_objects["ipam_namespace"]
+
+    # Create Prefixes for the Namespace, the Management Prefix included
+    prefixes_data = [
+        (prefix_data["prefix"], prefix_data["name"]) for prefix_data in extra_topology_vars_dict["prefixes"]
+    ]
+    prefixes_data.append((topology_dict["mgmt"]["ipv4-subnet"], "lab-mgmt-prefix"))
+    bulk_create_nautobot_objects(
+        nautobot_client,
+        url="/api/ipam/prefixes/",
+        items=[
+            {
+                "prefix": prefix,
                 "namespace": {"id": ipam_namespace["id"]},
                 "type": "network",
                 "status": {"id": statuses["id"]},
-                "description": prefix_data["name"],
-            },
-        )
-        console.log(f"Created Prefix: [orange1 i]{prefix['display']}", style="info")
-
-    # Create Management Prefix
-    mgmt_prefix = nautobot_client.http_call(
-        url="/api/ipam/prefixes/",
-        method="post",
-        json_data={
-            "prefix": topology_dict["mgmt"]["ipv4-subnet"],
-            "namespace": {"id": ipam_namespace["id"]},
-            "type": "network",
-            "status": {"id": statuses["id"]},
-            "description": "lab-mgmt-prefix",
-        },
+                "description": description,
+            }
+            for prefix, description in prefixes_data
+        ],
+        name="Prefix",
+        names="Prefixes",
+        verbose=verbose,
     )
-    console.log(f"Created Prefix: [orange1 i]{mgmt_prefix['display']}", style="info")
 
     # Create Devices
-    for node, node_data in topology_dict["topology"]["nodes"].items():
-        device = nautobot_client.http_call(
-            url="/api/dcim/devices/",
-            method="post",
-            json_data={
+    devices = bulk_create_nautobot_objects(
+        nautobot_client,
+        url="/api/dcim/devices/",
+        items=[
+            {
                 "name": node,
-                "role": {"id": roles["id"]},
-                "device_type": {"id": device_types["id"]},
+                "role": {"id": base_objects["roles"]["id"]},
+                "device_type": {"id": base_objects["device_types"]["id"]},
                 # "platform": "other",
-                "location": {"id": locations["id"]},
+                "location": {"id": base_objects["locations"]["id"]},
                 "status": {"id": statuses["id"]},
                 # "primary_ip4": {"id": ip_address["id"]},
                 "customn_fields": {
@@ -1260,99 +1507,95 @@ def utils_load_nautobot_data(
                         "node_address": node_data["mgmt-ipv4"],
                     }
                 },
-            },
-        )
-        console.log(f"Created Device: [orange1 i]{device['display']}", style="info")
+            }
+            for node, node_data in nodes.items()
+        ],
+        name="Device",
+        names="Devices",
+        verbose=verbose,
+    )
 
-        # Create IP Addresses and Interfaces
+    # Interfaces of every device, the Mgmt one included: (device, name, description, label, IP address)
+    interfaces_data = []
+    for device, node_data in zip(devices, nodes.values()):
         for intf_data in node_data["interfaces"]:
-            ip_address = nautobot_client.http_call(
-                url="/api/ipam/ip-addresses/",
-                method="post",
-                json_data={
-                    "address": intf_data["ipv4"],
-                    "status": {"id": statuses["id"]},
-                    "namespace": {"id": ipam_namespace["id"]},
-                    "type": "host",
-                },
+            interfaces_data.append(
+                (device, intf_data["name"], f"Interface {intf_data['name']}", intf_data["role"], intf_data["ipv4"])
             )
-            console.log(f"Created IP Address: [orange1 i]{ip_address['display']}", style="info")
-
-            interface = nautobot_client.http_call(
-                url="/api/dcim/interfaces/",
-                method="post",
-                json_data={
-                    "device": {"id": device["id"]},
-                    "name": intf_data["name"],
-                    "type": "virtual",
-                    "enabled": True,
-                    "description": f"Interface {intf_data['name']}",
-                    "status": {"id": statuses["id"]},
-                    "label": intf_data["role"],
-                },
-            )
-            console.log(f"Created Interface: [orange1 i]{device['display']}:{interface['display']}", style="info")
-
-            # Create IP address to interface mapping
-            mapping = nautobot_client.http_call(
-                url="/api/ipam/ip-address-to-interface/",
-                method="post",
-                json_data={
-                    "ip_address": {"id": ip_address["id"]},
-                    "interface": {"id": interface["id"]},
-                },
-            )
-            console.log(f"Created IP Address to Interface Mapping: [orange1 i]{mapping['display']}", style="info")
-
-        # Create Mgmt IP Address
-        mgmt_ip_address = nautobot_client.http_call(
-            url="/api/ipam/ip-addresses/",
-            method="post",
-            json_data={
-                "address": node_data["mgmt-ipv4"],
+        interfaces_data.append((device, "Management0", "Management Interface", "mgmt", node_data["mgmt-ipv4"]))
+
+    # Create IP Addresses
+    ip_addresses = bulk_create_nautobot_objects(
+        nautobot_client,
+        url="/api/ipam/ip-addresses/",
+        items=[
+            {
+                "address": address,
                 "status": {"id": statuses["id"]},
                 "namespace": {"id": ipam_namespace["id"]},
                 "type": "host",
-            },
-        )
-        console.log(f"Created Mgmt IP Address: [orange1 i]{mgmt_ip_address['display']}", style="info")
+            }
+            for _, _, _, _, address in interfaces_data
+        ],
+        name="IP Address",
+        names="IP Addresses",
+        verbose=verbose,
+    )
 
-        # Create Mgmt Interface
-        mgmt_interface = nautobot_client.http_call(
-            url="/api/dcim/interfaces/",
-            method="post",
-            json_data={
+    # Create Interfaces
+    interfaces = bulk_create_nautobot_objects(
+        nautobot_client,
+        url="/api/dcim/interfaces/",
+        items=[
+            {
                 "device": {"id": device["id"]},
-                "name": "Management0",
+                "name": name,
                 "type": "virtual",
                 "enabled": True,
-                "description": "Management Interface",
+                "description": description,
                 "status": {"id": statuses["id"]},
-                "label": "mgmt",
-            },
-        )
-        console.log(f"Created Mgmt Interface: [orange1 i]{device['display']}:{mgmt_interface['display']}", style="info")
-
-        # Create Mgmt IP address to interface mapping
-        mgmt_mapping = nautobot_client.http_call(
-            url="/api/ipam/ip-address-to-interface/",
-            method="post",
-            json_data={
-                "ip_address": {"id": mgmt_ip_address["id"]},
-                "interface": {"id": mgmt_interface["id"]},
-            },
-        )
-        console.log(f"Created Mgmt IP Address to Interface Mapping: [orange1 i]{mgmt_mapping['display']}", style="info")
-
-        # Update Device with Primary IP Address
-        device = nautobot_client.http_call(
-            url=f"/api/dcim/devices/{device['id']}/",
-            method="patch",
-            json_data={
-                "primary_ip4": {"id": mgmt_ip_address["id"]},
-            },
-        )
-        console.log(f"Updated Device: [orange1 i]{device['display']}", style="info")
+                "label": label,
+            }
+            for device, name, description, label, _ in interfaces_data
+        ],
+        name="Interface",
+        names="Interfaces",
+        verbose=verbose,
+    )
+
+    # Create IP address to interface mappings
+    bulk_create_nautobot_objects(
+        nautobot_client,
+        url="/api/ipam/ip-address-to-interface/",
+        items=[
+            {
+                "ip_address": {"id": ip_address["id"]},
+                "interface": {"id": interface["id"]},
+            }
+            for ip_address, interface in zip(ip_addresses, interfaces)
+        ],
+        name="IP Address to Interface Mapping",
+        names="IP Address to Interface Mappings",
+        verbose=verbose,
+    )
+
+    # Update Devices with their Mgmt IP Address as Primary IP Address
+    devices = bulk_create_nautobot_objects(
+        nautobot_client,
+        url="/api/dcim/devices/",
+        method="patch",
+        items=[
+            {
+                "id": device["id"],
+                "primary_ip4": {"id": ip_address["id"]},
+            }
+            for (device, name, *_), ip_address in zip(interfaces_data, ip_addresses)
+            if name == "Management0"
+        ],
+        name="Device",
+        names="Devices Primary IP Address",
+        verbose=verbose,
+    )
 
 
 @utils_app.command("delete-nautobot", rich_help_panel="Nautobot")
@@ -1367,96 +1610,82 @@ def utils_delete_nautobot_data(
     console.log("Instantiating Nautobot Client", style="info")
     nautobot_client = NautobotClient(url=nautobot_url, token=nautobot_token)
 
-    # Delete Devices
-    console.log("Delete Devices in Nautobot", style="info")
-    all_devices = nautobot_client.http_call(url="/api/dcim/devices/", method="get")
-    if all_devices["count"] > 0:
-        nautobot_client.http_call(url="/api/dcim/devices/", method="delete", json_data=all_devices["results"])
-
-    # Delete Locations
-    console.log("Delete Locations in Nautobot", style="info")
-    all_locations = nautobot_client.http_call(url="/api/dcim/locations/", method="get")
-    if all_locations["count"] > 0:
-        nautobot_client.http_call(url="/api/dcim/locations/", method="delete", json_data=all_locations["results"])
-
-    # Delete Location Types
-    console.log("Delete Location Types in Nautobot", style="info")
-    all_location_types = nautobot_client.http_call(url="/api/dcim/location-types/", method="get")
-    if all_location_types["count"] > 0:
-        nautobot_client.http_call(
-            url="/api/dcim/location-types/", method="delete", json_data=all_location_types["results"]
+    # Delete the objects before the ones they reference, the statuses being used by all of them
+    for name, url in [
+        ("Devices", "/api/dcim/devices/"),
+        ("Locations", "/api/dcim/locations/"),
+        ("Location Types", "/api/dcim/location-types/"),
+        ("Device Types", "/api/dcim/device-types/"),
+        ("Manufacturers", "/api/dcim/manufacturers/"),
+        ("Roles", "/api/extras/roles/"),
+        ("IP Address", "/api/ipam/ip-addresses/"),
+        ("Prefix", "/api/ipam/prefixes/"),
+        ("Namespace", "/api/ipam/namespaces/"),
+        ("Statuses", "/api/extras/statuses/"),
+    ]:
+        console.log(f"Delete {name} in Nautobot", style="info")
+        # Every page of objects, the bulk delete only needs their IDs
+        all_objects = nautobot_client.http_get_all(url=url)
+        nautobot_client.http_call_many(
+            url=url,
+            method="delete",
+            items=[{"id": nautobot_object["id"]} for nautobot_object in all_objects],
         )
 
-    # Delete Device Types
-    console.log("Delete Device Types in Nautobot", style="info")
-    all_device_types = nautobot_client.http_call(url="/api/dcim/device-types/", method="get")
-    if all_device_types["count"] > 0:
-        nautobot_client.http_call(url="/api/dcim/device-types/", method="delete", json_data=all_device_types["results"])
-
-    # Delete Manufacturers
-    console.log("Delete Manufacturers in Nautobot", style="info")
-    all_manufacturers = nautobot_client.http_call(url="/api/dcim/manufacturers/", method="get")
-    if all_manufacturers["count"] > 0:
-        nautobot_client.http_call(
-            url="/api/dcim/manufacturers/", method="delete", json_data=all_manufacturers["results"]
-        )
+    console.log("Nautobot data deleted", style="info")
 
-    # Delete Roles
-    console.log("Delete Roles in Nautobot", style="info")
-    all_roles = nautobot_client.http_call(url="/api/extras/roles/", method="get")
-    if all_roles["count"] > 0:
-        nautobot_client.http_call(url="/api/extras/roles/", method="delete", json_data=all_roles["results"])
-
-    # Delete IP Address
-    console.log("Delete IP Address in Nautobot", style="info")
-    all_ip_address = nautobot_client.http_call(url="/api/ipam/ip-addresses/", method="get")
-    if all_ip_address["count"] > 0:
-        nautobot_client.http_call(url="/api/ipam/ip-addresses/", method="delete", json_data=all_ip_address["results"])
-
-    # Delete Prefix
-    console.log("Delete Prefix in Nautobot", style="info")
-    all_prefix = nautobot_client.http_call(url="/api/ipam/prefixes/", method="get")
-    if all_prefix["count"] > 0:
-        nautobot_client.http_call(url="/api/ipam/prefixes/", method="delete", json_data=all_prefix["results"])
-
-    # Delete Namespace
-    console.log("Delete Namespace in Nautobot", style="info")
-    all_namespaces = nautobot_client.http_call(url="/api/ipam/namespaces/", method="get")
-    if all_namespaces["count"] > 0:
-        nautobot_client.http_call(url="/api/ipam/namespaces/", method="delete", json_data=all_namespaces["results"])
-
-    # Delete Statuses
-    console.log("Delete Statuses in Nautobot", style="info")
-    all_statuses = nautobot_client.http_call(url="/api/extras/statuses/", method="get")
-    if all_statuses["count"] > 0:
-        nautobot_client.http_call(url="/api/extras/statuses/", method="delete", json_data=all_statuses["results"])
 
-    console.log("Nautobot data deleted", style="info")
+def flap_device_interface(device: str, interface: str, count: int, delay: int):
+    """Flap an interface of a network device over a single SSH session.
 
+    Args:
+        device (str): Device to flap the interface of
+        interface (str): Interface to flap
+        count (int): Number of flaps
+        delay (int): Delay in seconds between the interface state changes
+    """
+    # Imported here, netmiko (and paramiko) is only needed by this command and slow to import on every CLI call
+    import netmiko
 
-@utils_app.command("device-interface-flap", rich_help_panel="Network Device")
-def utils_device_interface_flap(
-    device: Annotated[str, typer.Option(help="Device to flap interface", envvar="LAB_DEVICE")],
-    interface: Annotated[str, typer.Option(help="Interface to flap", envvar="LAB_INTERFACE")],
-    count: Annotated[int, typer.Option(help="Number of flaps", envvar="LAB_FLAP_COUNT")] = 1,
-    delay: Annotated[int, typer.Option(help="Delay between flaps", envvar="LAB_FLAP_DELAY")] = 5,
-):
-    """Flap a network device interface."""
     console.log(f"Flapping interface: [orange1 i]{interface} on device: {device}", style="info")
-    device_conn = netmiko.ConnectHandler(
+    # The session is closed even if a command fails
+    with netmiko.ConnectHandler(
         device_type="arista_eos",
         host=device,
         username="netobs",
         password="netobs123",
-    )
-    # Enable the config mode
-    device_conn.enable()
-    device_conn.config_mode()
-    for _ in range(count):
-        console.log("Bringing interface down...", style="info")
-        device_conn.send_config_set([f"interface {interface}", "shutdown"])
-        time.sleep(delay)
-        console.log("Bringing interface up...", style="info")
-        device_conn.send_config_set([f"interface {interface}", "no shutdown"])
-        time.sleep(delay)
+    ) as device_conn:
+        # The lab user is privilege 15 and `send_config_set` enters config mode on its own
+        shutdown_cmds = [f"interface {interface}", "shutdown"]
+        no_shutdown_cmds = [f"interface {interface}", "no shutdown"]
+        for _ in range(count):
+            console.log(f"Bringing interface down on device: {device}...", style="info")
+            device_conn.send_config_set(shutdown_cmds)
+            time.sleep(delay)
+            console.log(f"Bringing interface up on device: {device}...", style="info")
+            device_conn.send_config_set(no_shutdown_cmds)
+            time.sleep(delay)
     console.log(f"Flapped interface: [orange1 i]{interface} on device: {device}", style="info")
+
+
+@utils_app.command("device-interface-flap", rich_help_panel="Network Device")
+def utils_device_interface_flap(
+    devices: Annotated[
+        list[str], typer.Option("--device", help="Device(s) to flap interface", envvar="LAB_DEVICE")
+    ],
+    interface: Annotated[str, typer.Option(help="Interface to flap", envvar="LAB_INTERFACE")],
+    count: Annotated[int, typer.Option(help="Number of flaps", envvar="LAB_FLAP_COUNT")] = 1,
+    delay: Annotated[int, typer.Option(help="Delay between flaps", envvar="LAB_FLAP_DELAY")] = 5,
+):
+    """Flap a network device interface.
+
+    [u]Example:[/u]
+
+    To flap an interface on several devices at the same time:
+        [i]netobs utils device-interface-flap --device ceos-01 --device ceos-02 --interface Ethernet2[/i]
+    """
+    # Each device is flapped on its own SSH session, up to 8 devices at the same time
+    with ThreadPoolExecutor(max_workers=min(len(devices), 8)) as executor:
+        futures = [executor.submit(flap_device_interface, device, interface, count, delay) for device in devices]
+        for future in futures:
+            future.result()